@@ -1,15 +1,16 @@
 import os
 import sys
-import json
 from typing import Dict, Any
 
 # Add project root to path so imports work when running this script directly
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+if not __package__:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
 
 from tools.coverage_calculator import compute_coverage
-from mission_db.mission_repo import get_mission_by_id
+from tools import json_utils
+from mission_db.mission_repo import init_db, get_mission_by_id
 
 
 def run_coverage_agent(
@@ -36,6 +37,7 @@ if __name__ == "__main__":
     # Use mission_id from command line arg or default to latest mission
     mission_id = int(sys.argv[1]) if len(sys.argv) > 1 else 2  # default to mission #2
     
+    init_db()
     mission_data = get_mission_by_id(mission_id)
     if not mission_data:
         print(f" Mission #{mission_id} not found in database.")
@@ -46,4 +48,4 @@ if __name__ == "__main__":
     
     mission_spec = mission_data["mission_spec"]
     result = run_coverage_agent(mission_spec)
-    print(json.dumps(result, indent=2))
+    print(json_utils.dumps(result, indent=True))
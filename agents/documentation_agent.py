@@ -1,98 +1,151 @@
-import os
-import sys
-import json
 from typing import Dict, Any
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
 
-# Add project root to path
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+from tools import json_utils
+from tools.output_dirs import mission_output_dir
 
 
-def create_mission_brief(
-    mission_spec_json: str,
-    coverage_summary_json: str,
-    mission_id: int = 0,
-) -> str:
-    """
-    Create a comprehensive mission brief document.
-    
-    Args:
-        mission_spec_json: Mission specification as JSON string
-        coverage_summary_json: Coverage summary as JSON string  
-        mission_id: Mission ID number
-        
-    Returns:
-        Mission brief content as string
-    """
-    mission_spec = json.loads(mission_spec_json)
-    coverage_summary = json.loads(coverage_summary_json)
-    
-    # Build mission brief
-    brief = f"""# UAV Mission Brief - Mission #{mission_id:03d}
+# Mission brief header, filled with str.format_map in write_mission_brief
+# from a single dict of values. format_map re-parses the template on every
+# call, so this keeps the layout in one place rather than saving work.
+_BRIEF_TEMPLATE = """# UAV Mission Brief - Mission #{mission_id:03d}
 
 ## Mission Overview
 
-**Area**: {mission_spec['area']['length_m']}m x {mission_spec['area']['width_m']}m
-**Altitude**: {mission_spec['altitude_m']}m AGL
-**Camera FOV**: {mission_spec['camera_fov_deg']}°
+**Area**: {length_m}m x {width_m}m
+**Altitude**: {altitude_m}m AGL
+**Camera FOV**: {camera_fov_deg}°
 
 ## Flight Parameters
 
-**Number of Legs**: {coverage_summary['num_legs']}
-**Leg Length**: {coverage_summary['leg_length_m']}m
-**Total Distance**: {coverage_summary['total_path_length_m']}m
-**Estimated Flight Time**: {coverage_summary['total_flight_time_min']} minutes
-**Battery Segments**: {coverage_summary['num_battery_segments']}
-**Sweep Direction**: {coverage_summary['sweep_direction']}
+**Number of Legs**: {num_legs}
+**Leg Length**: {leg_length_m}m
+**Total Distance**: {total_path_length_m}m
+**Estimated Flight Time**: {total_flight_time_min} minutes
+**Battery Segments**: {num_battery_segments}
+**Sweep Direction**: {sweep_direction}
 
 ## Coverage Details
 
-**Swath Width**: {coverage_summary['swath_width_m']}m
-**Leg Spacing**: {coverage_summary['leg_spacing_m']}m
-**Cruise Speed**: {coverage_summary['cruise_speed_mps']} m/s
+**Swath Width**: {swath_width_m}m
+**Leg Spacing**: {leg_spacing_m}m
+**Cruise Speed**: {cruise_speed_mps} m/s
 
 **Overlap**:
-- Front Overlap: {mission_spec['overlap']['frontlap_percent']}%
-- Side Overlap: {mission_spec['overlap']['sidelap_percent']}%
+- Front Overlap: {frontlap_percent}%
+- Side Overlap: {sidelap_percent}%
 
 ## Safety Constraints
 
-**No-Fly Buffer**: {mission_spec.get('constraints', {}).get('no_fly_buffer_m', 'N/A')}m
-**Battery Reserve**: {mission_spec.get('constraints', {}).get('battery_reserve_percent', 'N/A')}%
+**No-Fly Buffer**: {no_fly_buffer_m}m
+**Battery Reserve**: {battery_reserve_percent}%
 
 ## Regulatory Information
 
-**Country**: {mission_spec.get('regulatory', {}).get('country', 'N/A')}
-**Authority**: {mission_spec.get('regulatory', {}).get('authority', 'N/A')}
+**Country**: {country}
+**Authority**: {authority}
 
-**Summary**: {mission_spec.get('regulatory', {}).get('summary', 'N/A')}
+**Summary**: {summary}
 
 **Notes**:
 """
+
+
+def write_mission_brief(
+    mission_spec: Dict[str, Any],
+    coverage_summary: Dict[str, Any],
+    mission_id: int = 0,
+) -> str:
+    """
+    Create a comprehensive mission brief document from parsed dicts.
+    
+    Python callers that already hold the dicts should use this directly
+    instead of round-tripping them through create_mission_brief.
+    
+    Args:
+        mission_spec: Mission specification
+        coverage_summary: Coverage summary from the coverage plan
+        mission_id: Mission ID number
+        
+    Returns:
+        Mission brief content as string
+    """
+    area = mission_spec['area']
+    overlap = mission_spec['overlap']
+    constraints = mission_spec.get('constraints', {})
+    regulatory = mission_spec.get('regulatory', {})
+    
+    ctx = {
+        "mission_id": mission_id,
+        "length_m": area['length_m'],
+        "width_m": area['width_m'],
+        "altitude_m": mission_spec['altitude_m'],
+        "camera_fov_deg": mission_spec['camera_fov_deg'],
+        "frontlap_percent": overlap['frontlap_percent'],
+        "sidelap_percent": overlap['sidelap_percent'],
+        "no_fly_buffer_m": constraints.get('no_fly_buffer_m', 'N/A'),
+        "battery_reserve_percent": constraints.get('battery_reserve_percent', 'N/A'),
+        "country": regulatory.get('country', 'N/A'),
+        "authority": regulatory.get('authority', 'N/A'),
+        "summary": regulatory.get('summary', 'N/A'),
+        "num_legs": coverage_summary['num_legs'],
+        "leg_length_m": coverage_summary['leg_length_m'],
+        "total_path_length_m": coverage_summary['total_path_length_m'],
+        "total_flight_time_min": coverage_summary['total_flight_time_min'],
+        "num_battery_segments": coverage_summary['num_battery_segments'],
+        "sweep_direction": coverage_summary['sweep_direction'],
+        "swath_width_m": coverage_summary['swath_width_m'],
+        "leg_spacing_m": coverage_summary['leg_spacing_m'],
+        "cruise_speed_mps": coverage_summary['cruise_speed_mps'],
+    }
+    
+    # Build mission brief as a list of parts and join once at the end,
+    # rather than growing one string with += inside the note loops
+    parts = [_BRIEF_TEMPLATE.format_map(ctx)]
     
     # Add regulatory notes
-    for note in mission_spec.get('regulatory', {}).get('notes', []):
-        brief += f"- {note}\n"
+    for note in regulatory.get('notes', []):
+        parts.append(f"- {note}\n")
     
-    brief += "\n## Mission Notes\n\n"
+    parts.append("\n## Mission Notes\n\n")
     
     # Add mission notes
     for note in mission_spec.get('notes', []):
-        brief += f"- {note}\n"
+        parts.append(f"- {note}\n")
     
-    # Save to file
-    output_dir = f"missions/{mission_id}"
-    os.makedirs(output_dir, exist_ok=True)
+    brief = "".join(parts)
     
-    with open(f"{output_dir}/mission_brief.md", "w") as f:
-        f.write(brief)
+    # Save to file
+    output_dir = mission_output_dir(mission_id)
+    (output_dir / "mission_brief.md").write_bytes(brief.encode("utf-8"))
     
     return brief
 
 
+def create_mission_brief(
+    mission_spec_json: str,
+    coverage_summary_json: str,
+    mission_id: int = 0,
+) -> str:
+    """
+    Create a comprehensive mission brief document.
+    
+    Args:
+        mission_spec_json: Mission specification as JSON string
+        coverage_summary_json: Coverage summary as JSON string  
+        mission_id: Mission ID number
+        
+    Returns:
+        Mission brief content as string
+    """
+    return write_mission_brief(
+        mission_spec=json_utils.loads(mission_spec_json),
+        coverage_summary=json_utils.loads(coverage_summary_json),
+        mission_id=mission_id,
+    )
+
+
 # ADK Agent for documentation
 documentation_agent = Agent(
     name="documentation_agent",
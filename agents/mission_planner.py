@@ -1,18 +1,18 @@
 import os
 import sys
-import json
 import asyncio
 from dotenv import load_dotenv
 from google.adk.agents import Agent
-from google.adk.runners import InMemoryRunner
 from google.adk.tools import google_search
 
 # Add project root to path so imports work when running this script directly
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
+if not __package__:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
 
 from mission_db.mission_repo import init_db, create_mission_with_spec  # 👈 new import
+from tools import json_utils
 
 load_dotenv()
 GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY")
@@ -76,6 +76,9 @@ async def mission_planner_main():
     # make sure DB exists
     init_db()
 
+    # Imported here so importing this module for its agent (main.py,
+    # pipeline.py) doesn't load the runner
+    from google.adk.runners import InMemoryRunner
     runner = InMemoryRunner(agent=mission_planner)
 
     # later this will come from CLI / UI
@@ -91,8 +94,7 @@ async def mission_planner_main():
     text = getattr(last, "output", None) or getattr(last, "content", None) or str(last)
     text = str(text)
 
-    json_str = text[text.find("{"): text.rfind("}") + 1]
-    mission_spec = json.loads(json_str)
+    mission_spec = json_utils.extract_json(text)
 
     # store everything in SQLite
     mission_id = create_mission_with_spec(
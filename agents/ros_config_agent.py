@@ -1,15 +1,55 @@
 import os
 import sys
-import json
+import math
+import asyncio
+import functools
+from pathlib import Path
 from typing import Dict, Any, List
+import numpy as np
 
+# Add project root to path so imports work when running this script directly
+if not __package__:
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    if project_root not in sys.path:
+        sys.path.insert(0, project_root)
 
-project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-if project_root not in sys.path:
-    sys.path.insert(0, project_root)
-
-from mission_db.mission_repo import get_mission_by_id
+from mission_db.mission_repo import init_db, get_mission_by_id
 from agents.coverage_agent import run_coverage_agent
+from tools import json_utils
+from tools.output_dirs import mission_output_dir
+
+
+def _legs_to_latlon(xs_start, ys_start, xs_end, ys_end, origin_lat, origin_lon, m2lat, m2lon):
+    """Convert local leg endpoints (metres) to a (2N, 2) array of [lat, lon].
+
+    Rows alternate start/end for each leg, matching waypoint order.
+    """
+    out = np.empty((2 * xs_start.shape[0], 2), dtype=np.float64)
+    out[0::2, 0] = origin_lat + ys_start * m2lat
+    out[0::2, 1] = origin_lon + xs_start * m2lon
+    out[1::2, 0] = origin_lat + ys_end * m2lat
+    out[1::2, 1] = origin_lon + xs_end * m2lon
+    return out
+
+
+# numba is optional and slow to import, and compiling (or loading the
+# cached build) costs far more than converting a typical plan, so the JIT
+# is only used on plans with at least this many legs
+_JIT_MIN_LEGS = 100_000
+
+
+@functools.cache
+def _jit_legs_to_latlon():
+    """_legs_to_latlon compiled with numba, or None if numba isn't installed.
+
+    Compiled without fastmath so the output matches the plain NumPy path
+    bit for bit. Set NUMBA_DISABLE_JIT=1 to run it uncompiled.
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    return njit(cache=True)(_legs_to_latlon)
 
 
 def generate_ros_waypoints(
@@ -30,35 +70,62 @@ def generate_ros_waypoints(
     Returns:
         List of waypoint dictionaries with GPS coordinates
     """
-    waypoints = []
-    legs = coverage_plan.get("legs", [])
     altitude = mission_spec.get("altitude_m", 50.0)
+    legs = coverage_plan.get("legs", [])
     
-    # Approximate conversion: 1 meter ≈ 0.00001 degrees (rough estimate)
+    # Equirectangular approximation: a degree of latitude is ~111.32 km
+    # everywhere, a degree of longitude shrinks with cos(latitude).
+    # Both scales are loop invariants, computed once per call.
     # For more accurate conversion, use proper geodetic calculations
-    meters_to_lat = 1.0 / 111320.0  # 1 degree latitude ≈ 111.32 km
-    meters_to_lon = 1.0 / (111320.0 * abs(origin_lat / 90.0))  # Adjusted for latitude
+    meters_to_lat = 1.0 / 111320.0
+    meters_to_lon = 1.0 / (111320.0 * math.cos(math.radians(origin_lat)))
+    
+    kernel = _jit_legs_to_latlon() if len(legs) >= _JIT_MIN_LEGS else None
+    if kernel is not None:
+        # Leg endpoints as columns, converted in one compiled pass; each
+        # output row is one leg's (start_lat, start_lon, end_lat, end_lon)
+        xs_start, ys_start, xs_end, ys_end = (
+            np.fromiter((leg[column] for leg in legs), dtype=np.float64, count=len(legs))
+            for column in ("x_start_m", "y_start_m", "x_end_m", "y_end_m")
+        )
+        leg_latlon = kernel(
+            xs_start, ys_start, xs_end, ys_end,
+            origin_lat, origin_lon, meters_to_lat, meters_to_lon,
+        ).reshape(-1, 4).tolist()
+    else:
+        # The legs arrive as dicts and leave as dicts, so for typical plans
+        # a plain loop beats converting them to arrays and back
+        leg_latlon = [
+            (
+                origin_lat + leg["y_start_m"] * meters_to_lat,
+                origin_lon + leg["x_start_m"] * meters_to_lon,
+                origin_lat + leg["y_end_m"] * meters_to_lat,
+                origin_lon + leg["x_end_m"] * meters_to_lon,
+            )
+            for leg in legs
+        ]
     
-    for leg in legs:
-        # Start waypoint
+    waypoints = []
+    for wp_id, leg, (start_lat, start_lon, end_lat, end_lon) in zip(
+        range(1, 2 * len(legs) + 1, 2), legs, leg_latlon
+    ):
+        leg_id = leg["leg_id"]
         waypoints.append({
-            "id": len(waypoints) + 1,
+            "id": wp_id,
             "type": "waypoint",
-            "latitude": origin_lat + (leg["y_start_m"] * meters_to_lat),
-            "longitude": origin_lon + (leg["x_start_m"] * meters_to_lon),
+            "latitude": start_lat,
+            "longitude": start_lon,
             "altitude": altitude,
-            "leg_id": leg["leg_id"],
+            "leg_id": leg_id,
             "position": "start",
         })
-        
-        # End waypoint
         waypoints.append({
-            "id": len(waypoints) + 1,
+            "id": wp_id + 1,
             "type": "waypoint",
-            "latitude": origin_lat + (leg["y_end_m"] * meters_to_lat),
-            "longitude": origin_lon + (leg["x_end_m"] * meters_to_lon),
+            "latitude": end_lat,
+            "longitude": end_lon,
             "altitude": altitude,
-            "leg_id": leg["leg_id"],
+            "leg_id": leg_id,
             "position": "end",
         })
     
@@ -80,10 +147,12 @@ def generate_ros_config(
         ROS2 configuration dictionary
     """
     summary = coverage_plan.get("coverage_summary", {})
+    altitude_m = mission_spec.get("altitude_m", 50.0)
+    constraints = mission_spec.get("constraints", {})
     
     config = {
         "mission_parameters": {
-            "altitude_m": mission_spec.get("altitude_m", 50.0),
+            "altitude_m": altitude_m,
             "cruise_speed_mps": summary.get("cruise_speed_mps", 8.0),
             "camera_fov_deg": mission_spec.get("camera_fov_deg", 78.0),
             "overlap": mission_spec.get("overlap", {}),
@@ -95,10 +164,10 @@ def generate_ros_config(
             "num_battery_segments": summary.get("num_battery_segments", 1),
         },
         "safety_parameters": {
-            "no_fly_buffer_m": mission_spec.get("constraints", {}).get("no_fly_buffer_m", 100),
-            "battery_reserve_percent": mission_spec.get("constraints", {}).get("battery_reserve_percent", 20),
+            "no_fly_buffer_m": constraints.get("no_fly_buffer_m", 100),
+            "battery_reserve_percent": constraints.get("battery_reserve_percent", 20),
             "max_wind_speed_mps": 10.0,
-            "return_to_home_altitude_m": mission_spec.get("altitude_m", 50.0) + 20,
+            "return_to_home_altitude_m": altitude_m + 20,
         },
         "regulatory": mission_spec.get("regulatory", {}),
     }
@@ -152,10 +221,31 @@ def run_ros_config_agent(
     return ros_package
 
 
+async def write_ros_files(
+    waypoints: List[Dict[str, Any]],
+    config: Dict[str, Any],
+    output_dir: Any,
+) -> None:
+    """
+    Write ros_waypoints.json and ros_config.json into output_dir.
+    
+    Both files are serialized and written concurrently in worker threads,
+    so the event loop stays free while the pipeline's other branch runs.
+    Waypoints are only read by ROS tooling and are written compact; the
+    config stays indented for people tuning it by hand.
+    """
+    output_dir = Path(output_dir)
+    await asyncio.gather(
+        asyncio.to_thread(json_utils.dump_file, waypoints, output_dir / "ros_waypoints.json"),
+        asyncio.to_thread(json_utils.dump_file, config, output_dir / "ros_config.json", True),
+    )
+
+
 if __name__ == "__main__":
     # Get mission spec from database
     mission_id = int(sys.argv[1]) if len(sys.argv) > 1 else 2
     
+    init_db()
     mission_data = get_mission_by_id(mission_id)
     if not mission_data:
         print(f"Mission #{mission_id} not found in database.")
@@ -182,17 +272,12 @@ if __name__ == "__main__":
     print("=" * 70)
     print("ROS2 MISSION PACKAGE")
     print("=" * 70)
-    print(json.dumps(ros_package, indent=2))
+    print(json_utils.dumps(ros_package, indent=True))
     
     # Optionally save to file
-    output_dir = f"missions/{mission_id}"
-    os.makedirs(output_dir, exist_ok=True)
-    
-    with open(f"{output_dir}/ros_waypoints.json", "w") as f:
-        json.dump(ros_package["waypoints"], f, indent=2)
+    output_dir = mission_output_dir(mission_id)
     
-    with open(f"{output_dir}/ros_config.json", "w") as f:
-        json.dump(ros_package["config"], f, indent=2)
+    asyncio.run(write_ros_files(ros_package["waypoints"], ros_package["config"], output_dir))
     
     print(f"\nFiles saved to {output_dir}/")
     print("  - ros_waypoints.json")
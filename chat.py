@@ -2,6 +2,10 @@
 import os
 import sys
 import asyncio
+import functools
+import traceback
+import uuid
+from cachetools import TTLCache
 from dotenv import load_dotenv
 from google.adk.agents import LlmAgent
 from google.adk.runners import Runner, InMemoryRunner
@@ -15,6 +19,8 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from mission_db.mission_repo import init_db, list_missions, get_mission_by_id
+from tools import json_utils
+from tools.session_keys import MISSION_ID_KEY
 
 load_dotenv()
 
@@ -25,61 +31,108 @@ if not GOOGLE_API_KEY:
 APP_NAME = "MissionCopilot"
 USER_ID = "pilot_1"
 
-def get_all_missions(max_results: int = 10) -> str:
+# Tool responses are read by the model, so they are compact by default;
+# set COPILOT_DEBUG_JSON=1 to pretty-print them while debugging.
+DEBUG_JSON = os.environ.get("COPILOT_DEBUG_JSON") == "1"
+
+# Artifacts the pipeline writes under missions/<id>/
+MISSION_FILES = ("mission_brief.md", "ros_waypoints.json", "ros_config.json")
+
+# Serialized tool responses, keyed by ("list", max_results) or
+# ("mission", mission_id). The copilot tends to re-query the same missions
+# turn after turn; create_new_mission clears this when the DB changes.
+# SQLite calls run via asyncio.to_thread to keep the event loop free while
+# the runner streams the model response.
+_mission_cache = TTLCache(maxsize=128, ttl=5.0)
+
+# Each pipeline run fans out to two concurrent LLM calls in its final
+# (ParallelAgent) stage; allowing two runs at a time keeps at most four
+# requests in flight so overlapping create_new_mission calls don't trip
+# Gemini rate limits. Runs can safely overlap: each gets its own session,
+# the saved mission id lives in that session's state, and the recorded
+# payloads in tools/mission_state.py are keyed by mission id.
+MAX_CONCURRENT_PIPELINES = 2
+_pipeline_slots = asyncio.Semaphore(MAX_CONCURRENT_PIPELINES)
+
+
+async def get_all_missions(max_results: int = 10) -> str:
     """Get list of all missions from database."""
-    import json
-    missions = list_missions()
-    return json.dumps(missions[:max_results], indent=2)
+    key = ("list", max_results)
+    result = _mission_cache.get(key)
+    if result is None:
+        missions = await asyncio.to_thread(list_missions)
+        result = json_utils.dumps(missions[:max_results], indent=DEBUG_JSON)
+        _mission_cache[key] = result
+    return result
 
 
-def get_mission_details(mission_id: int) -> str:
+async def get_mission_details(mission_id: int) -> str:
     """Get detailed information about a specific mission."""
-    import json
-    mission = get_mission_by_id(mission_id)
-    if not mission:
-        return json.dumps({"error": f"Mission {mission_id} not found"})
-    return json.dumps(mission, indent=2)
+    key = ("mission", mission_id)
+    result = _mission_cache.get(key)
+    if result is None:
+        mission = await asyncio.to_thread(get_mission_by_id, mission_id)
+        if not mission:
+            result = json_utils.dumps({"error": f"Mission {mission_id} not found"})
+        else:
+            result = json_utils.dumps(mission, indent=DEBUG_JSON)
+        _mission_cache[key] = result
+    return result
+
+
+@functools.cache
+def _get_pipeline_runner() -> InMemoryRunner:
+    """Build the pipeline runner once, on first use (main.py pulls in every agent)."""
+    from main import uav_pipeline
+    return InMemoryRunner(agent=uav_pipeline)
 
 
 async def create_new_mission(user_request: str) -> str:
     """Create complete mission by running pipeline."""
-    import json
-    
     try:
-        from main import uav_pipeline
-        
-        runner = InMemoryRunner(agent=uav_pipeline)
-        response = await runner.run_debug(user_request)
-        
-        missions = list_missions()
-        if missions:
-            latest_mission = missions[0]
-            
-            return json.dumps({
+        # The runner is shared, so give each mission a fresh session rather
+        # than letting it pick up the previous mission's conversation
+        runner = _get_pipeline_runner()
+        session_id = f"mission_{uuid.uuid4().hex}"
+        try:
+            async with _pipeline_slots:
+                response = await runner.run_debug(user_request, user_id=USER_ID, session_id=session_id)
+            _mission_cache.clear()
+
+            # The newest row may belong to an overlapping run; the mission this
+            # run saved is the one recorded in its own session state
+            session = await runner.session_service.get_session(
+                app_name=runner.app_name, user_id=USER_ID, session_id=session_id
+            )
+            mission_id = session.state.get(MISSION_ID_KEY, 0) if session else 0
+        finally:
+            # The session is only needed for this run; drop it so the
+            # shared runner doesn't keep every mission's conversation
+            await runner.session_service.delete_session(
+                app_name=runner.app_name, user_id=USER_ID, session_id=session_id
+            )
+        mission = await asyncio.to_thread(get_mission_by_id, mission_id) if mission_id else None
+        if mission:
+            return json_utils.dumps({
                 "status": "success",
-                "mission_id": latest_mission["id"],
-                "name": latest_mission["name"],
-                "message": f"Mission {latest_mission['id']} created successfully!",
-                "files": [
-                    f"missions/{latest_mission['id']}/mission_brief.md",
-                    f"missions/{latest_mission['id']}/ros_waypoints.json",
-                    f"missions/{latest_mission['id']}/ros_config.json"
-                ]
-            }, indent=2)
+                "mission_id": mission_id,
+                "name": mission["name"],
+                "message": f"Mission {mission_id} created successfully!",
+                "files": [f"missions/{mission_id}/{name}" for name in MISSION_FILES],
+            }, indent=DEBUG_JSON)
         else:
-            return json.dumps({
+            return json_utils.dumps({
                 "status": "error",
                 "message": "Pipeline completed but no mission found in database"
-            }, indent=2)
+            }, indent=DEBUG_JSON)
             
     except Exception as e:
-        import traceback
-        return json.dumps({
+        return json_utils.dumps({
             "status": "error",
             "message": str(e),
             "type": type(e).__name__,
             "traceback": traceback.format_exc()
-        }, indent=2)
+        }, indent=DEBUG_JSON)
 
 
 async def auto_save_to_memory(callback_context):
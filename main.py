@@ -9,10 +9,10 @@ Pipeline:
 import os
 import sys
 import asyncio
+from typing import Dict, Any, Optional
 from dotenv import load_dotenv
 from google.adk.agents import Agent, SequentialAgent, ParallelAgent
-from google.adk.runners import InMemoryRunner
-from google.adk.tools import FunctionTool
+from google.adk.tools import FunctionTool, ToolContext
 
 # Add project root to path
 project_root = os.path.dirname(os.path.abspath(__file__))
@@ -22,9 +22,15 @@ if project_root not in sys.path:
 # Import specialized agents and tools
 from agents.mission_planner import mission_planner
 from agents.coverage_agent import run_coverage_agent
-from agents.ros_config_agent import generate_ros_waypoints, generate_ros_config
-from agents.documentation_agent import create_mission_brief
-from mission_db.mission_repo import init_db, create_mission_with_spec
+from agents.ros_config_agent import generate_ros_waypoints, generate_ros_config, write_ros_files
+from agents.documentation_agent import write_mission_brief
+from mission_db.mission_repo import (
+    init_db,
+    create_mission_with_spec,
+)
+from tools import mission_state
+from tools.json_tool import json_tool
+from tools.output_dirs import mission_output_dir
 
 load_dotenv()
 
@@ -36,29 +42,28 @@ if not GOOGLE_API_KEY:
 
 # === STEP 1: Database Saver Agent ===
 # This agent saves mission specs to the database
-def save_mission_to_db(mission_spec_json: str, user_request: str) -> str:
+@json_tool
+async def save_mission_to_db(
+    mission_spec_json: Dict[str, Any], user_request: str, tool_context: ToolContext = None
+) -> Dict[str, Any]:
     """Save mission specification to database."""
-    import json
-    
-    # Extract JSON if it contains extra text
-    try:
-        mission_spec = json.loads(mission_spec_json)
-    except json.JSONDecodeError:
-        start = mission_spec_json.find("{")
-        end = mission_spec_json.rfind("}") + 1
-        mission_spec = json.loads(mission_spec_json[start:end])
+    mission_spec = mission_spec_json
     
-    mission_id = create_mission_with_spec(
+    mission_id = await asyncio.to_thread(
+        create_mission_with_spec,
         user_request=user_request,
         mission_spec=mission_spec,
         name=f"Mission from pipeline"
     )
     
-    return json.dumps({
+    mission_state.remember_mission_id(tool_context, mission_id)
+    mission_state.start_mission(mission_id, mission_spec)
+    
+    return {
         "mission_id": mission_id,
         "status": "saved",
         "message": f"Mission #{mission_id} saved successfully"
-    })
+    }
 
 
 db_saver_agent = Agent(
@@ -74,19 +79,13 @@ Call save_mission_to_db with the mission spec JSON and confirm it was saved.""",
 
 
 # === STEP 2: Coverage Agent (as ADK Agent) ===
-def calculate_coverage(mission_spec_json: str) -> str:
+@json_tool
+def calculate_coverage(mission_spec_json: Dict[str, Any], tool_context: ToolContext = None) -> Dict[str, Any]:
     """Calculate coverage plan from mission spec."""
-    import json
-    
-    # Extract JSON if it contains extra text
-    try:
-        mission_spec = json.loads(mission_spec_json)
-    except json.JSONDecodeError:
-        start = mission_spec_json.find("{")
-        end = mission_spec_json.rfind("}") + 1
-        mission_spec = json.loads(mission_spec_json[start:end])
+    mission_spec = mission_spec_json
     result = run_coverage_agent(mission_spec)
-    return json.dumps(result)
+    mission_state.record_coverage(tool_context, mission_spec, result)
+    return {"coverage_summary": result["coverage_summary"]}
 
 
 coverage_agent = Agent(
@@ -103,23 +102,16 @@ Present the coverage summary clearly.""",
 
 
 # === STEP 3: ROS Config Agent (as ADK Agent) ===
-def generate_ros_package(mission_spec_json: str, coverage_plan_json: str) -> str:
+@json_tool
+async def generate_ros_package(
+    mission_spec_json: Optional[Dict[str, Any]],
+    tool_context: ToolContext = None,
+) -> Dict[str, Any]:
     """Generate ROS2 waypoints and config."""
-    import json
-    
-    try:
-        mission_spec = json.loads(mission_spec_json)
-    except json.JSONDecodeError:
-        start = mission_spec_json.find("{")
-        end = mission_spec_json.rfind("}") + 1
-        mission_spec = json.loads(mission_spec_json[start:end])
+    mission_id = mission_state.current_mission_id(tool_context)
     
-    try:
-        coverage_plan = json.loads(coverage_plan_json)
-    except json.JSONDecodeError:
-        start = coverage_plan_json.find("{")
-        end = coverage_plan_json.rfind("}") + 1
-        coverage_plan = json.loads(coverage_plan_json[start:end])
+    mission_spec = mission_state.mission_payload(mission_id, "mission_spec", mission_spec_json)
+    coverage_plan = mission_state.coverage_plan(mission_id, mission_spec)
     
     waypoints = generate_ros_waypoints(coverage_plan, mission_spec)
     config = generate_ros_config(mission_spec, coverage_plan)
@@ -130,31 +122,19 @@ def generate_ros_package(mission_spec_json: str, coverage_plan_json: str) -> str
         "total_waypoints": len(waypoints),
     }
     
-    from mission_db.mission_repo import list_missions
-    missions = list_missions()
-    if missions:
-        mission_id = missions[0]["id"]
-        output_dir = f"missions/{mission_id}"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        with open(f"{output_dir}/ros_waypoints.json", "w") as f:
-            json.dump(waypoints, f, indent=2)
-        
-        with open(f"{output_dir}/ros_config.json", "w") as f:
-            json.dump(config, f, indent=2)
+    if mission_id:
+        await write_ros_files(waypoints, config, mission_output_dir(mission_id))
     
-    return json.dumps(ros_package)
+    return ros_package
 
 
 ros_config_agent = Agent(
     name="ros_config_agent",
     model="gemini-2.5-flash-lite",
     description="Generates ROS2 configuration files",
-    instruction="""You receive:
-- mission_spec: {mission_spec}
-- coverage_plan: {coverage_plan}
+    instruction="""You receive mission_spec: {mission_spec}
 
-Call generate_ros_package with both JSONs.
+Call generate_ros_package with the mission spec JSON.
 Confirm ROS config was generated successfully.""",
     tools=[FunctionTool(generate_ros_package)],
     output_key="ros_config",
@@ -162,33 +142,23 @@ Confirm ROS config was generated successfully.""",
 
 
 # === STEP 4: Documentation Agent (as ADK Agent) ===
-def generate_mission_brief(mission_spec_json: str, coverage_plan_json: str) -> str:
+@json_tool
+async def generate_mission_brief(
+    mission_spec_json: Optional[Dict[str, Any]],
+    tool_context: ToolContext = None,
+) -> str:
     """Generate mission briefing document."""
-    import json
-    
-    try:
-        mission_spec = json.loads(mission_spec_json)
-    except json.JSONDecodeError:
-        start = mission_spec_json.find("{")
-        end = mission_spec_json.rfind("}") + 1
-        mission_spec = json.loads(mission_spec_json[start:end])
+    mission_id = mission_state.current_mission_id(tool_context)
     
-    try:
-        coverage_plan = json.loads(coverage_plan_json)
-    except json.JSONDecodeError:
-        start = coverage_plan_json.find("{")
-        end = coverage_plan_json.rfind("}") + 1
-        coverage_plan = json.loads(coverage_plan_json[start:end])
+    mission_spec = mission_state.mission_payload(mission_id, "mission_spec", mission_spec_json)
+    coverage_plan = mission_state.coverage_plan(mission_id, mission_spec)
     
     coverage_summary = coverage_plan.get("coverage_summary", {})
     
-    from mission_db.mission_repo import list_missions
-    missions = list_missions()
-    mission_id = missions[0]["id"] if missions else 0
-    
-    brief = create_mission_brief(
-        mission_spec_json=mission_spec_json,
-        coverage_summary_json=json.dumps(coverage_summary),
+    brief = await asyncio.to_thread(
+        write_mission_brief,
+        mission_spec=mission_spec,
+        coverage_summary=coverage_summary,
         mission_id=mission_id,
     )
     
@@ -199,11 +169,9 @@ documentation_agent = Agent(
     name="documentation_agent",
     model="gemini-2.5-flash-lite",
     description="Creates mission briefing documents",
-    instruction="""You receive:
-- mission_spec: {mission_spec}
-- coverage_plan: {coverage_plan}
+    instruction="""You receive mission_spec: {mission_spec}
 
-Call generate_mission_brief with both JSONs.
+Call generate_mission_brief with the mission spec JSON.
 Confirm the brief was created successfully.""",
     tools=[FunctionTool(generate_mission_brief)],
     output_key="mission_brief",
@@ -213,7 +181,10 @@ Confirm the brief was created successfully.""",
 # === MULTI-AGENT PIPELINE ===
 # Following the notebook pattern: Sequential → Parallel
 
-# Parallel team for ROS config and documentation (independent tasks)
+# Parallel team for ROS config and documentation (independent tasks).
+# ParallelAgent runs each sub-agent in its own asyncio task, so both LLM
+# calls are in flight at once and the stage costs max(), not sum(), of the
+# two. Concurrency across pipeline runs is capped in chat.py.
 parallel_output_team = ParallelAgent(
     name="ParallelOutputTeam",
     sub_agents=[
@@ -256,7 +227,10 @@ async def main():
     print(f"\nUser Request: {user_request}\n")
     print("Running pipeline: mission_planner → db_saver → coverage → [ros_config || docs]\n")
     
-    # Run the entire pipeline
+    # Run the entire pipeline. The runner (sessions, artifacts, memory) is
+    # only needed here, so importing main for its agents doesn't load it
+    # (agents/mission_planner.py defers its runner import too).
+    from google.adk.runners import InMemoryRunner
     runner = InMemoryRunner(agent=uav_pipeline)
     response = await runner.run_debug(user_request)
     
@@ -1,36 +1,93 @@
 import sqlite3
-from datetime import datetime
-from typing import Optional, Dict, Any
+import threading
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, Iterable, Tuple, Union
 import json
 
 DB_PATH = "missions.db"
 
+# One connection per thread, kept open for the life of the process
+_local = threading.local()
+
+# Shared by the single and bulk inserts, so sqlite3's statement cache
+# prepares it once per connection
+_INSERT_MISSION_SQL = """
+    INSERT INTO missions (name, user_request, mission_spec_json, status)
+    VALUES (?, ?, ?, ?);
+"""
+
+# created_at is stored as integer Unix seconds, filled in by SQLite
+_MISSIONS_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS {table} (
+        id               INTEGER PRIMARY KEY AUTOINCREMENT,
+        name             TEXT,
+        user_request     TEXT NOT NULL,
+        mission_spec_json TEXT NOT NULL,   -- full JSON spec as text
+        created_at       INTEGER NOT NULL DEFAULT (strftime('%s', 'now')),
+        status           TEXT NOT NULL
+    );
+"""
+
 
 def get_connection() -> sqlite3.Connection:
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH)
+        conn.row_factory = sqlite3.Row
+        # WAL + synchronous=NORMAL avoids an fsync on every commit
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA temp_store=MEMORY;")
+        conn.execute("PRAGMA cache_size=-20000;")
+        _local.conn = conn
     return conn
 
 
 def init_db() -> None:
     conn = get_connection()
-    cur = conn.cursor()
 
-    cur.execute(
+    # The connection outlives this call, so a failed migration must not
+    # leave its transaction (and the write lock) open
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        conn.execute(_MISSIONS_TABLE_SQL.format(table="missions"))
+        _migrate_text_created_at(conn)
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_missions_created ON missions (created_at DESC);"
+        )
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+
+def _migrate_text_created_at(conn: sqlite3.Connection) -> None:
+    """Convert a database with ISO-string created_at values to epoch seconds."""
+    columns = {row["name"]: row for row in conn.execute("PRAGMA table_info(missions);")}
+    if columns["created_at"]["type"].upper() != "TEXT":
+        return
+
+    # SQLite can't change a column's type or default in place, so rebuild
+    # the table, keeping the existing mission ids
+    conn.execute(_MISSIONS_TABLE_SQL.format(table="missions_migrated"))
+    conn.execute(
         """
-        CREATE TABLE IF NOT EXISTS missions (
-            id               INTEGER PRIMARY KEY AUTOINCREMENT,
-            name             TEXT,
-            user_request     TEXT NOT NULL,
-            mission_spec_json TEXT NOT NULL,   -- full JSON spec as text
-            created_at       TEXT NOT NULL,
-            status           TEXT NOT NULL
-        );
+        INSERT INTO missions_migrated (id, name, user_request, mission_spec_json, created_at, status)
+        SELECT id, name, user_request, mission_spec_json,
+               CAST(strftime('%s', rtrim(created_at, 'Z')) AS INTEGER), status
+        FROM missions;
         """
     )
+    conn.execute("DROP TABLE missions;")
+    conn.execute("ALTER TABLE missions_migrated RENAME TO missions;")
+
 
-    conn.commit()
-    conn.close()
+def _iso_timestamp(created_at: Union[int, str]) -> str:
+    """Format a stored created_at for API responses (ISO 8601, UTC)."""
+    if isinstance(created_at, str):
+        # A database init_db() hasn't migrated yet still holds the ISO text
+        return created_at
+    return datetime.fromtimestamp(created_at, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 def create_mission_with_spec(
@@ -41,33 +98,57 @@ def create_mission_with_spec(
 ) -> int:
     """Insert a mission row with full JSON spec; return mission_id."""
     conn = get_connection()
-    cur = conn.cursor()
 
-    created_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
     mission_spec_json = json.dumps(mission_spec)
 
-    cur.execute(
-        """
-        INSERT INTO missions (name, user_request, mission_spec_json, created_at, status)
-        VALUES (?, ?, ?, ?, ?);
-        """,
-        (name, user_request, mission_spec_json, created_at, status),
-    )
+    # Commits on success and rolls back on error, so a failed insert doesn't
+    # hold the write lock on this thread's persistent connection
+    with conn:
+        cur = conn.execute(
+            _INSERT_MISSION_SQL,
+            (name, user_request, mission_spec_json, status),
+        )
+
+    return cur.lastrowid
 
-    mission_id = cur.lastrowid
-    conn.commit()
-    conn.close()
-    return mission_id
+
+def create_missions_bulk(
+    rows: Iterable[Tuple[str, Dict[str, Any], Optional[str], str]],
+) -> list[int]:
+    """
+    Insert many missions in one transaction; return their mission_ids.
+
+    Each row is (user_request, mission_spec, name, status), the same
+    values create_mission_with_spec takes.
+    """
+    conn = get_connection()
+
+    params = [
+        (name, user_request, json.dumps(mission_spec), status)
+        for user_request, mission_spec, name, status in rows
+    ]
+    if not params:
+        return []
+
+    # One write transaction (and one commit) for the whole batch instead of
+    # one per row. Holding the write lock also keeps the new ids contiguous.
+    conn.execute("BEGIN IMMEDIATE;")
+    try:
+        conn.executemany(_INSERT_MISSION_SQL, params)
+        last_id = conn.execute("SELECT max(id) FROM missions;").fetchone()[0]
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+
+    return list(range(last_id - len(params) + 1, last_id + 1))
 
 
 def get_mission_by_id(mission_id: int) -> Optional[Dict[str, Any]]:
     """Fetch mission row + parse JSON spec."""
     conn = get_connection()
-    cur = conn.cursor()
 
-    cur.execute("SELECT * FROM missions WHERE id = ?;", (mission_id,))
-    row = cur.fetchone()
-    conn.close()
+    row = conn.execute("SELECT * FROM missions WHERE id = ?;", (mission_id,)).fetchone()
 
     if row is None:
         return None
@@ -78,7 +159,7 @@ def get_mission_by_id(mission_id: int) -> Optional[Dict[str, Any]]:
         "id": row["id"],
         "name": row["name"],
         "user_request": row["user_request"],
-        "created_at": row["created_at"],
+        "created_at": _iso_timestamp(row["created_at"]),
         "status": row["status"],
         "mission_spec": mission_spec,
     }
@@ -87,25 +168,30 @@ def get_mission_by_id(mission_id: int) -> Optional[Dict[str, Any]]:
 def list_missions() -> list[Dict[str, Any]]:
     """Lightweight list (no big JSON)."""
     conn = get_connection()
-    cur = conn.cursor()
 
-    cur.execute(
+    rows = conn.execute(
         """
         SELECT id, name, user_request, created_at, status
         FROM missions
         ORDER BY id DESC;
         """
-    )
-    rows = cur.fetchall()
-    conn.close()
+    ).fetchall()
 
     return [
         {
             "id": row["id"],
             "name": row["name"],
             "user_request": row["user_request"],
-            "created_at": row["created_at"],
+            "created_at": _iso_timestamp(row["created_at"]),
             "status": row["status"],
         }
         for row in rows
     ]
+
+
+def get_latest_mission_id() -> int:
+    """Id of the most recently created mission, or 0 if there are none."""
+    conn = get_connection()
+
+    row = conn.execute("SELECT id FROM missions ORDER BY id DESC LIMIT 1;").fetchone()
+    return row["id"] if row is not None else 0
@@ -2,154 +2,117 @@
 Shared UAV Mission Planning Pipeline
 Used by both main.py and chat.py
 """
+import asyncio
 from google.adk.agents import Agent, SequentialAgent, ParallelAgent
-from google.adk.tools import FunctionTool
-import json
+from google.adk.tools import FunctionTool, ToolContext
+from typing import Dict, Any, Optional
 
 
 # Import all agent components
 from agents.mission_planner import mission_planner
 from agents.coverage_agent import run_coverage_agent
-from agents.ros_config_agent import run_ros_config_agent
+from agents.ros_config_agent import (
+    run_ros_config_agent, generate_ros_waypoints, generate_ros_config, write_ros_files,
+)
 from agents.documentation_agent import create_mission_brief
 from mission_db.mission_repo import create_mission_with_spec
+from tools import json_utils
+from tools import mission_state
+from tools.json_tool import json_tool
+from tools.output_dirs import mission_output_dir
+
+
+def _resolve_mission_id(db_save_result: Optional[Dict[str, Any]], tool_context: Any) -> int:
+    """Mission id from the session state, else from db_save_result."""
+    db_mission_id = 0
+    if isinstance(db_save_result, dict):
+        db_mission_id = db_save_result.get("mission_id", 0)
+    return mission_state.current_mission_id(tool_context, default=db_mission_id)
+
+
+def _write_brief(path: Any, header: str, regulatory: Any) -> None:
+    """Write the brief header, then the regulatory JSON as serialized bytes."""
+    with open(path, "wb") as f:
+        f.write(header.encode("utf-8"))
+        f.write(json_utils.dumps_bytes(regulatory, indent=True))
+        f.write(b"\n")
 
 
 # === SHARED PIPELINE TOOLS ===
 
-def save_mission_to_db(mission_spec_json: str, user_request: str) -> str:
+@json_tool
+async def save_mission_to_db(
+    mission_spec_json: Dict[str, Any], user_request: str, tool_context: ToolContext = None
+) -> Dict[str, Any]:
     """Save mission specification to database."""
-    # Extract JSON if it contains extra text
-    try:
-        mission_spec = json.loads(mission_spec_json)
-    except json.JSONDecodeError:
-        start = mission_spec_json.find("{")
-        end = mission_spec_json.rfind("}") + 1
-        mission_spec = json.loads(mission_spec_json[start:end])
+    mission_spec = mission_spec_json
     
-    mission_id = create_mission_with_spec(
+    mission_id = await asyncio.to_thread(
+        create_mission_with_spec,
         user_request=user_request,
         mission_spec=mission_spec,
         name="Automated mission"
     )
     
-    # Store mission_id globally so other functions can access it
-    import os
-    os.environ['CURRENT_MISSION_ID'] = str(mission_id)
+    mission_state.start_mission(mission_id, mission_spec)
+    mission_state.remember_mission_id(tool_context, mission_id)
     
-    return json.dumps({"mission_id": mission_id, "status": "saved"})
+    return {"mission_id": mission_id, "status": "saved"}
 
 
-def calculate_coverage(mission_spec_json: str) -> str:
+@json_tool
+def calculate_coverage(mission_spec_json: Dict[str, Any], tool_context: ToolContext = None) -> Dict[str, Any]:
     """Calculate coverage plan from mission spec."""
-    # Extract JSON if it contains extra text
-    try:
-        mission_spec = json.loads(mission_spec_json)
-    except json.JSONDecodeError:
-        start = mission_spec_json.find("{")
-        end = mission_spec_json.rfind("}") + 1
-        mission_spec = json.loads(mission_spec_json[start:end])
+    mission_spec = mission_spec_json
     
     coverage_result = run_coverage_agent(mission_spec)
-    return json.dumps(coverage_result)
+    mission_state.record_coverage(tool_context, mission_spec, coverage_result)
+    return {"coverage_summary": coverage_result["coverage_summary"]}
 
 
-def generate_ros_package(mission_spec_json: str, coverage_plan_json: str, db_save_result: str = None) -> str:
+@json_tool
+async def generate_ros_package(
+    mission_spec_json: Optional[Dict[str, Any]],
+    db_save_result: Optional[Dict[str, Any]] = None,
+    tool_context: ToolContext = None,
+) -> str:
     """Generate ROS2 waypoints and config."""
-    # Extract mission_id from db_save_result if provided
-    mission_id = 0
-    if db_save_result:
-        try:
-            db_result = json.loads(db_save_result)
-            mission_id = db_result.get("mission_id", 0)
-        except:
-            pass
-    
-    # Fallback to environment variable
-    if mission_id == 0:
-        import os
-        mission_id = int(os.environ.get('CURRENT_MISSION_ID', 0))
-    
-    # Extract JSON from mission_spec if it contains extra text
-    try:
-        mission_spec = json.loads(mission_spec_json)
-    except json.JSONDecodeError:
-        start = mission_spec_json.find("{")
-        end = mission_spec_json.rfind("}") + 1
-        mission_spec = json.loads(mission_spec_json[start:end])
+    mission_id = _resolve_mission_id(db_save_result, tool_context)
     
-    # Extract JSON from coverage_plan if it contains extra text
-    try:
-        coverage_plan = json.loads(coverage_plan_json)
-    except json.JSONDecodeError:
-        start = coverage_plan_json.find("{")
-        end = coverage_plan_json.rfind("}") + 1
-        coverage_plan = json.loads(coverage_plan_json[start:end])
-    
-    from agents.ros_config_agent import generate_ros_waypoints, generate_ros_config
-    import os
+    mission_spec = mission_state.mission_payload(mission_id, "mission_spec", mission_spec_json)
+    coverage_plan = mission_state.coverage_plan(mission_id, mission_spec)
     
     waypoints = generate_ros_waypoints(coverage_plan, mission_spec)
     config = generate_ros_config(mission_spec, coverage_plan)
     
     if mission_id > 0:
-        output_dir = f"missions/{mission_id}"
-        os.makedirs(output_dir, exist_ok=True)
-        
-        with open(f"{output_dir}/ros_waypoints.json", "w") as f:
-            json.dump(waypoints, f, indent=2)
-        
-        with open(f"{output_dir}/ros_config.json", "w") as f:
-            json.dump(config, f, indent=2)
+        await write_ros_files(waypoints, config, mission_output_dir(mission_id))
         
         return f"ROS config files created successfully in missions/{mission_id}/"
     else:
         return "ERROR: Could not determine mission_id. Files not saved."
 
 
-def generate_mission_brief(mission_spec_json: str, coverage_plan_json: str, db_save_result: str = None) -> str:
+@json_tool
+async def generate_mission_brief(
+    mission_spec_json: Optional[Dict[str, Any]],
+    db_save_result: Optional[Dict[str, Any]] = None,
+    tool_context: ToolContext = None,
+) -> Dict[str, Any]:
     """Generate mission briefing document."""
-    # Extract mission_id from db_save_result if provided
-    mission_id = 0
-    if db_save_result:
-        try:
-            db_result = json.loads(db_save_result)
-            mission_id = db_result.get("mission_id", 0)
-        except:
-            pass
+    mission_id = _resolve_mission_id(db_save_result, tool_context)
     
-    # Fallback to environment variable
     if mission_id == 0:
-        import os
-        mission_id = int(os.environ.get('CURRENT_MISSION_ID', 0))
-    
-    # Extract JSON from mission_spec if it contains extra text
-    try:
-        mission_spec = json.loads(mission_spec_json)
-    except json.JSONDecodeError:
-        start = mission_spec_json.find("{")
-        end = mission_spec_json.rfind("}") + 1
-        mission_spec = json.loads(mission_spec_json[start:end])
+        return {"status": "error", "message": "No mission_id found"}
     
-    # Extract JSON from coverage_plan if it contains extra text
-    try:
-        coverage_plan = json.loads(coverage_plan_json)
-    except json.JSONDecodeError:
-        start = coverage_plan_json.find("{")
-        end = coverage_plan_json.rfind("}") + 1
-        coverage_plan = json.loads(coverage_plan_json[start:end])
+    mission_spec = mission_state.mission_payload(mission_id, "mission_spec", mission_spec_json)
+    coverage_plan = mission_state.coverage_plan(mission_id, mission_spec)
     
-    import os
-    
-    if mission_id == 0:
-        return json.dumps({"status": "error", "message": "No mission_id found"})
-    
-    output_dir = f"missions/{mission_id}"
-    os.makedirs(output_dir, exist_ok=True)
+    output_dir = mission_output_dir(mission_id)
     
     coverage_summary = coverage_plan.get("coverage_summary", {})
     
-    brief_content = f"""# Mission {mission_id} Brief
+    brief_header = f"""# Mission {mission_id} Brief
 
 ## Mission Specifications
 - Area: {mission_spec['area']['length_m']}m x {mission_spec['area']['width_m']}m
@@ -162,17 +125,22 @@ def generate_mission_brief(mission_spec_json: str, coverage_plan_json: str, db_s
 - Flight Time: {coverage_summary.get('total_flight_time_min', 0)} min
 
 ## Regulatory Information
-{json.dumps(mission_spec.get('regulatory', {}), indent=2)}
 """
     
-    with open(f"{output_dir}/mission_brief.md", "w") as f:
-        f.write(brief_content)
+    # The regulatory block can be the largest part of the brief; it goes
+    # to the file as bytes rather than into one big str first
+    await asyncio.to_thread(
+        _write_brief,
+        output_dir / "mission_brief.md",
+        brief_header,
+        mission_spec.get("regulatory", {}),
+    )
     
-    return json.dumps({
+    return {
         "status": "success",
         "mission_id": mission_id,
         "file_created": f"missions/{mission_id}/mission_brief.md"
-    })
+    }
 
 
 # === BUILD PIPELINE AGENTS ===
@@ -209,11 +177,10 @@ ros_config_agent = Agent(
     description="Generates ROS2 waypoint files",
     instruction="""You receive:
 - mission_spec: {mission_spec}
-- coverage_plan: {coverage_plan}
 - db_save_result: {db_save_result}
 
-Call generate_ros_package and pass ALL THREE parameters:
-generate_ros_package(mission_spec_json=mission_spec, coverage_plan_json=coverage_plan, db_save_result=db_save_result)""",
+Call generate_ros_package and pass BOTH parameters:
+generate_ros_package(mission_spec_json=mission_spec, db_save_result=db_save_result)""",
     tools=[FunctionTool(generate_ros_package)],
     output_key="ros_config_output",
 )
@@ -224,16 +191,16 @@ documentation_agent = Agent(
     description="Creates mission documentation",
     instruction="""You receive:
 - mission_spec: {mission_spec}
-- coverage_plan: {coverage_plan}
 - db_save_result: {db_save_result}
 
-Call generate_mission_brief and pass ALL THREE parameters:
-generate_mission_brief(mission_spec_json=mission_spec, coverage_plan_json=coverage_plan, db_save_result=db_save_result)""",
+Call generate_mission_brief and pass BOTH parameters:
+generate_mission_brief(mission_spec_json=mission_spec, db_save_result=db_save_result)""",
     tools=[FunctionTool(generate_mission_brief)],
     output_key="mission_brief_output",
 )
 
-# Define parallel outputs (ROS + Docs)
+# Define parallel outputs (ROS + Docs); ParallelAgent runs both sub-agents
+# concurrently, each in its own asyncio task
 parallel_outputs_agent = ParallelAgent(
     name="ParallelOutputs",
     sub_agents=[ros_config_agent, documentation_agent],
@@ -1,16 +1,32 @@
 import httpx
 import asyncio
 
+# HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# Shared across probes so repeated checks reuse the pooled connection
+# instead of paying for a new TLS handshake each time
+_CLIENT = httpx.AsyncClient(timeout=5.0, http2=HTTP2_AVAILABLE)
+
 async def test_connection():
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get("https://www.google.com")
-            print(f"Connection successful! Status: {response.status_code}")
-            return True
+        # HEAD returns the same status without transferring a body
+        response = await _CLIENT.head("https://www.google.com")
+        print(f"Connection successful! Status: {response.status_code}")
+        return True
     except Exception as e:
         print(f"Connection failed: {e}")
         return False
 
-if __name__ == "__main__":
-    asyncio.run(test_connection())
+async def main():
+    try:
+        return await test_connection()
+    finally:
+        await _CLIENT.aclose()
 
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,17 +1,160 @@
 
 import math
-from typing import Dict, Any
+from typing import Dict, Any, List, Sequence, Union
+
+import numpy as np
+
+from tools.schemas import MissionSpec, as_mission_spec
+
+
+def _lawnmower_legs(
+    num_legs: int,
+    leg_spacing_m: float,
+    leg_length_m: float,
+    sweep_direction: str,
+) -> List[Dict[str, Any]]:
+    """
+    Lawnmower legs in local coordinates, rounded to millimetres.
+
+    Legs alternate direction: even legs run 0 -> leg_length_m, odd legs
+    run back, and each leg is offset by leg_spacing_m across the field.
+    """
+    legs = []
+    for i in range(num_legs):
+        leg_id = i + 1
+        offset = i * leg_spacing_m
+
+        if sweep_direction == "along_length":
+            # X: 0 -> length_m, Y: alternating
+            if i % 2 == 0:
+                x_start, y_start = 0.0, offset
+                x_end, y_end = leg_length_m, offset
+            else:
+                x_start, y_start = leg_length_m, offset
+                x_end, y_end = 0.0, offset
+        else:
+            # along_width
+            if i % 2 == 0:
+                x_start, y_start = offset, 0.0
+                x_end, y_end = offset, leg_length_m
+            else:
+                x_start, y_start = offset, leg_length_m
+                x_end, y_end = offset, 0.0
+
+        legs.append(
+            {
+                "leg_id": leg_id,
+                "x_start_m": round(x_start, 3),
+                "y_start_m": round(y_start, 3),
+                "x_end_m": round(x_end, 3),
+                "y_end_m": round(y_end, 3),
+            }
+        )
+
+    return legs
+
+
+def compute_coverage_batch(
+    mission_specs: Sequence[Union[MissionSpec, Dict[str, Any]]],
+    cruise_speed_mps: float = 8.0,
+    max_flight_time_min: float = 20.0,
+) -> List[Dict[str, Any]]:
+    """
+    Compute coverage plans for many missions at once.
+
+    The per-mission scalar math (swath, spacing, leg counts, flight time)
+    runs as NumPy operations over arrays holding one entry per mission;
+    returns one compute_coverage() result per spec, in order.
+    """
+    if len(mission_specs) <= 1:
+        # Building the arrays only pays off across several missions
+        return [
+            compute_coverage(spec, cruise_speed_mps, max_flight_time_min)
+            for spec in mission_specs
+        ]
+
+    #Extract inputs into one float64 array per field
+    specs = [as_mission_spec(spec) for spec in mission_specs]
+    length_m = np.array([spec.area.length_m for spec in specs], dtype=np.float64)   # X direction
+    width_m = np.array([spec.area.width_m for spec in specs], dtype=np.float64)     # Y direction
+    altitude_m = np.array([spec.altitude_m for spec in specs], dtype=np.float64)
+    fov_deg = np.array([spec.camera_fov_deg for spec in specs], dtype=np.float64)
+    sidelap_percent = np.array([spec.overlap.sidelap_percent for spec in specs], dtype=np.float64)
+
+    #Ground swath width from FOV and altitude
+    #swath = 2 * h * tan(FOV/2)
+    swath_width_m = 2 * altitude_m * np.tan(np.deg2rad(fov_deg) / 2)
+
+    #Leg spacing from sidelap
+    leg_spacing_m = swath_width_m * (1.0 - sidelap_percent / 100.0)
+    has_spacing = leg_spacing_m > 0
+    safe_spacing = np.where(has_spacing, leg_spacing_m, 1.0)
+
+    #Choose sweep direction: along length or along width
+    #Option A: legs run along length (X axis), spacing along width (Y axis)
+    num_legs_along_length = np.where(has_spacing, np.ceil(width_m / safe_spacing), 1.0)
+    path_length_along_length = num_legs_along_length * length_m
+
+    #Option B: legs run along width (Y axis), spacing along length (X axis)
+    num_legs_along_width = np.where(has_spacing, np.ceil(length_m / safe_spacing), 1.0)
+    path_length_along_width = num_legs_along_width * width_m
+
+    along_length = path_length_along_length <= path_length_along_width
+    num_legs = np.where(along_length, num_legs_along_length, num_legs_along_width)
+    leg_length_m = np.where(along_length, length_m, width_m)
+    field_span_m = np.where(along_length, width_m, length_m)
+
+    #Recompute spacing for selected direction to fit nicely
+    multi_leg = num_legs > 1
+    leg_spacing_m = np.where(multi_leg, field_span_m / np.where(multi_leg, num_legs - 1, 1.0), 0.0)
+
+    total_path_length_m = num_legs * leg_length_m
+
+    #Time and battery segments
+    total_flight_time_min = (total_path_length_m / cruise_speed_mps) / 60.0
+    num_battery_segments = np.maximum(1.0, np.ceil(total_flight_time_min / max_flight_time_min))
+
+    results = []
+    for i, is_along_length in enumerate(along_length.tolist()):
+        sweep_direction = "along_length" if is_along_length else "along_width"
+        legs_i = int(num_legs[i])
+        spacing_i = float(leg_spacing_m[i])
+        leg_length_i = float(leg_length_m[i])
+
+        #Generate legs in local coordinates
+        #(x, y) in metres with origin at bottom-left corner
+        legs = _lawnmower_legs(legs_i, spacing_i, leg_length_i, sweep_direction)
+
+        coverage_summary = {
+            "sweep_direction": sweep_direction,
+            "swath_width_m": round(float(swath_width_m[i]), 3),
+            "leg_spacing_m": round(spacing_i, 3),
+            "num_legs": legs_i,
+            "leg_length_m": round(leg_length_i, 3),
+            "total_path_length_m": round(float(total_path_length_m[i]), 3),
+            "cruise_speed_mps": cruise_speed_mps,
+            "total_flight_time_min": round(float(total_flight_time_min[i]), 2),
+            "num_battery_segments": int(num_battery_segments[i]),
+        }
+
+        results.append({
+            "coverage_summary": coverage_summary,
+            "legs": legs,
+        })
+
+    return results
 
 
 def compute_coverage(
-    mission_spec: Dict[str, Any],
+    mission_spec: Union[MissionSpec, Dict[str, Any]],
     cruise_speed_mps: float = 8.0,
     max_flight_time_min: float = 20.0,
 ) -> Dict[str, Any]:
     """
     Compute coverage pattern (lawnmower) for a rectangular field.
 
-    mission_spec is the JSON produced by mission_planner:
+    mission_spec is a MissionSpec, or the JSON dict produced by
+    mission_planner:
     {
       "area": { "length_m": ..., "width_m": ... },
       "altitude_m": ...,
@@ -22,19 +165,18 @@ def compute_coverage(
       },
       "constraints": { ... }
     }
+
     """
 
     #Extract inputs 
-    area = mission_spec.get("area", {})
-    length_m = float(area.get("length_m", 0.0))   # X direction
-    width_m = float(area.get("width_m", 0.0))     # Y direction
+    spec = as_mission_spec(mission_spec)
+    length_m = spec.area.length_m   # X direction
+    width_m = spec.area.width_m     # Y direction
 
-    altitude_m = float(mission_spec.get("altitude_m", 50.0))
-    fov_deg = float(mission_spec.get("camera_fov_deg", 78.0))
+    altitude_m = spec.altitude_m
+    fov_deg = spec.camera_fov_deg
 
-    overlap = mission_spec.get("overlap", {})
-    frontlap_percent = float(overlap.get("frontlap_percent", 75.0))
-    sidelap_percent = float(overlap.get("sidelap_percent", 65.0))
+    sidelap_percent = spec.overlap.sidelap_percent
 
     #Ground swath width from FOV and altitude
     #swath = 2 * h * tan(FOV/2)
@@ -79,37 +221,7 @@ def compute_coverage(
 
     #Generate legs in local coordinates
     #(x, y) in metres with origin at bottom-left corner
-    legs = []
-    for i in range(num_legs):
-        leg_id = i + 1
-        offset = i * leg_spacing_m
-
-        if sweep_direction == "along_length":
-            # X: 0 -> length_m, Y: alternating
-            if i % 2 == 0:
-                x_start, y_start = 0.0, offset
-                x_end, y_end = leg_length_m, offset
-            else:
-                x_start, y_start = leg_length_m, offset
-                x_end, y_end = 0.0, offset
-        else:
-            # along_width
-            if i % 2 == 0:
-                x_start, y_start = offset, 0.0
-                x_end, y_end = offset, leg_length_m
-            else:
-                x_start, y_start = offset, leg_length_m
-                x_end, y_end = offset, 0.0
-
-        legs.append(
-            {
-                "leg_id": leg_id,
-                "x_start_m": round(x_start, 3),
-                "y_start_m": round(y_start, 3),
-                "x_end_m": round(x_end, 3),
-                "y_end_m": round(y_end, 3),
-            }
-        )
+    legs = _lawnmower_legs(num_legs, leg_spacing_m, leg_length_m, sweep_direction)
 
     coverage_summary = {
         "sweep_direction": sweep_direction,
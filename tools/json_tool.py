@@ -0,0 +1,96 @@
+"""
+Decorator for ADK tools that exchange JSON with the model.
+
+The model passes mission specs, coverage plans and db results to the
+pipeline tools as JSON strings, and reads JSON strings back. json_tool
+does that decoding and encoding in one place, so a tool is written
+against dicts:
+
+    @json_tool
+    def calculate_coverage(mission_spec_json: dict) -> dict: ...
+
+To ADK (and so to the model) the tool still takes and returns strings.
+"""
+import functools
+import inspect
+import typing
+from typing import Any, Callable, Dict, Tuple
+
+from tools import json_utils
+
+
+def _dict_param(annotation: Any) -> Tuple[bool, bool]:
+    """Return (is_dict, optional) for a parameter annotation."""
+    if annotation is dict or typing.get_origin(annotation) is dict:
+        return True, False
+    if typing.get_origin(annotation) is typing.Union:
+        args = [arg for arg in typing.get_args(annotation) if arg is not type(None)]
+        if len(args) == 1 and (args[0] is dict or typing.get_origin(args[0]) is dict):
+            return True, True
+    return False, False
+
+
+def _decode(value: Any, optional: bool) -> Any:
+    if not isinstance(value, (str, bytes)):
+        return value  # already parsed by ADK, or None
+    if not optional:
+        return json_utils.loads_cached(value)
+    try:
+        return json_utils.loads_cached(value)
+    except json_utils.JSONDecodeError:
+        # Optional payloads may be prose (e.g. an agent's summary);
+        # the tool falls back to its own source for them
+        return None
+
+
+def _encode(result: Any) -> Any:
+    return result if isinstance(result, str) else json_utils.dumps(result)
+
+
+def json_tool(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a tool whose dict parameters arrive as JSON strings.
+
+    Parameters annotated dict / Dict[...] are decoded with
+    json_utils.loads_cached and raise on invalid JSON; Optional[dict]
+    ones become None instead. Decoded values are cached and shared, so
+    tools must not mutate them. A non-str return value is serialized.
+    """
+    signature = inspect.signature(fn)
+    decoders: Dict[str, bool] = {}
+    params = []
+    for name, param in signature.parameters.items():
+        is_dict, optional = _dict_param(param.annotation)
+        if is_dict:
+            decoders[name] = optional
+            param = param.replace(annotation=str)
+        params.append(param)
+    exposed = signature.replace(parameters=params, return_annotation=str)
+
+    def decode_args(args: tuple, kwargs: dict) -> inspect.BoundArguments:
+        bound = signature.bind(*args, **kwargs)
+        for name, optional in decoders.items():
+            if name in bound.arguments:
+                bound.arguments[name] = _decode(bound.arguments[name], optional)
+        return bound
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = decode_args(args, kwargs)
+            return _encode(await fn(*bound.args, **bound.kwargs))
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = decode_args(args, kwargs)
+            return _encode(fn(*bound.args, **bound.kwargs))
+
+    # ADK builds the function declaration from these, so it keeps seeing
+    # the string-typed signature the instructions were written for
+    wrapper.__signature__ = exposed
+    wrapper.__annotations__ = {
+        **{name: param.annotation for name, param in exposed.parameters.items()
+           if param.annotation is not inspect.Parameter.empty},
+        "return": str,
+    }
+    return wrapper
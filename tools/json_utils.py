@@ -0,0 +1,114 @@
+"""
+JSON helpers shared by the agents and tools.
+
+Uses orjson when it is installed, then ujson (for parsing), and falls
+back to the stdlib json module otherwise, so callers never need to care
+which one is active.
+"""
+import functools
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+# Second choice for parsing when orjson is missing; only loads() uses it.
+try:
+    import ujson
+except ImportError:  # ujson is optional
+    ujson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so existing
+# `except json.JSONDecodeError` handlers keep working with either backend.
+JSONDecodeError = json.JSONDecodeError
+
+_decoder = json.JSONDecoder()
+
+
+def loads(s: Any) -> Any:
+    """Parse JSON from a str or bytes object."""
+    if orjson is not None:
+        return orjson.loads(s)
+    if ujson is not None:
+        try:
+            return ujson.loads(s)
+        except ValueError:
+            # Re-parse with the stdlib so callers get a json.JSONDecodeError
+            # with a position, same as the other backends
+            pass
+    return json.loads(s)
+
+
+def dumps_bytes(obj: Any, indent: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes (2-space indent if indent=True)."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """Serialize obj to a JSON string (2-space indent if indent=True)."""
+    if orjson is not None:
+        return dumps_bytes(obj, indent=indent).decode("utf-8")
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+
+def dump_file(obj: Any, path: Any, indent: bool = False) -> None:
+    """Serialize obj and write it to path as UTF-8 JSON bytes."""
+    with open(path, "wb") as f:
+        f.write(dumps_bytes(obj, indent=indent))
+
+
+def extract_object(text: str) -> Any:
+    """
+    Parse the first JSON object embedded in text, e.g. LLM output with
+    prose around it.
+
+    Decoding starts at the first "{" and stops at its matching brace, so
+    trailing text is never scanned or copied. If that brace does not open
+    valid JSON (a "{placeholder}" in the prose, say), the next one is tried.
+    """
+    start = text.find("{")
+    while start >= 0:
+        try:
+            obj, _ = _decoder.raw_decode(text, start)
+            return obj
+        except JSONDecodeError:
+            start = text.find("{", start + 1)
+    raise JSONDecodeError("No JSON object found", text, 0)
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse a JSON object from model output, trying the cheap cases first.
+
+    Pure JSON (surrounding whitespace included) is handled by one loads()
+    call; a reply wrapped in ```json fences is unwrapped and parsed as-is;
+    anything else falls back to extract_object().
+    """
+    try:
+        return loads(text)
+    except JSONDecodeError:
+        pass
+    stripped = text.strip()
+    if stripped.startswith("```"):
+        body = stripped.removeprefix("```json").removeprefix("```").removesuffix("```")
+        try:
+            return loads(body)
+        except JSONDecodeError:
+            pass
+    return extract_object(text)
+
+
+@functools.lru_cache(maxsize=32)
+def loads_cached(s: str) -> Any:
+    """
+    Parse a JSON tool argument, tolerating extra text around the object.
+
+    Results are cached by string, so a payload handed to several pipeline
+    tools is only decoded once. The returned object is shared between
+    callers and must not be mutated.
+    """
+    return extract_json(s)
@@ -0,0 +1,95 @@
+"""
+Parsed payloads of the missions currently going through the pipeline.
+
+save_mission_to_db and calculate_coverage (main.py and pipeline.py)
+record their dicts here, keyed by mission id, so the later stages don't
+depend on what the model passes back, and overlapping runs don't
+overwrite each other. This is also the only place the coverage legs
+travel: the model is handed the coverage summary alone.
+
+The id of the mission a run saved is kept in the ADK session state
+instead, under MISSION_ID_KEY, since that is carried from one tool call
+to the next.
+"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from mission_db.mission_repo import get_latest_mission_id
+from tools.coverage_calculator import compute_coverage
+from tools.session_keys import MISSION_ID_KEY
+
+# Only the few most recent missions are kept; a run reads its payloads
+# back within the same pipeline invocation
+_MAX_MISSIONS = 8
+_missions: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+
+
+def start_mission(mission_id: int, mission_spec: Dict[str, Any]) -> None:
+    """Start recording payloads for mission_id, evicting the oldest mission."""
+    _missions[mission_id] = {"mission_spec": mission_spec}
+    _missions.move_to_end(mission_id)
+    while len(_missions) > _MAX_MISSIONS:
+        _missions.popitem(last=False)
+
+
+def remember_mission_id(tool_context: Any, mission_id: int) -> None:
+    """Store mission_id in the session state of the running pipeline."""
+    if tool_context is not None:
+        tool_context.state[MISSION_ID_KEY] = mission_id
+
+
+def current_mission_id(tool_context: Any, default: int = 0) -> int:
+    """
+    Id of the mission saved earlier in this session, else default.
+
+    Without a tool_context (a tool called outside an ADK runner) the
+    newest mission in the database is the last resort.
+    """
+    if tool_context is not None:
+        return tool_context.state.get(MISSION_ID_KEY, 0) or default
+    return default or get_latest_mission_id()
+
+
+def record_coverage(
+    tool_context: Any, mission_spec: Dict[str, Any], coverage_plan: Dict[str, Any]
+) -> None:
+    """Record coverage_plan under the mission saved earlier in this session."""
+    mission_id = tool_context.state.get(MISSION_ID_KEY, 0) if tool_context is not None else 0
+    if not mission_id:
+        # Outside a runner: the newest recorded mission with this spec.
+        # Compared by value, since the coverage agent sends its own JSON
+        # text for the spec, which rarely matches the db saver's exactly.
+        mission_id = next(
+            (mid for mid, payloads in reversed(_missions.items())
+             if payloads["mission_spec"] == mission_spec),
+            0,
+        )
+    payloads = _missions.get(mission_id)
+    if payloads is not None:
+        payloads["coverage_plan"] = coverage_plan
+
+
+def recorded(mission_id: int, key: str) -> Optional[Dict[str, Any]]:
+    """Return the payload recorded for mission_id, if any."""
+    payloads = _missions.get(mission_id) if mission_id else None
+    return payloads.get(key) if payloads is not None else None
+
+
+def coverage_plan(mission_id: int, mission_spec: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Full coverage plan (legs included) for mission_id.
+
+    The model only ever sees the coverage summary, so the plan is the one
+    calculate_coverage recorded, or is regenerated from mission_spec.
+    """
+    return recorded(mission_id, "coverage_plan") or compute_coverage(mission_spec)
+
+
+def mission_payload(mission_id: int, key: str, payload: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the recorded payload for mission_id, else the one the model passed."""
+    recorded_payload = recorded(mission_id, key)
+    if recorded_payload is not None:
+        return recorded_payload
+    if payload is None:
+        raise ValueError(f"No valid {key} JSON for mission {mission_id}")
+    return payload
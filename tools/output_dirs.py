@@ -0,0 +1,27 @@
+"""
+Output directory helpers for mission artifacts (missions/<mission_id>/).
+
+Directories are created at most once per process: several artifacts are
+written to the same mission directory, and repeating makedirs for each
+one costs a stat + mkdir syscall every time.
+"""
+from pathlib import Path
+from typing import Union
+
+MISSIONS_DIR = Path("missions")
+
+_ensured_dirs: set[Path] = set()
+
+
+def ensure_dir(path: Union[str, Path]) -> Path:
+    """Create path (and parents) unless this process already did; return it."""
+    path = Path(path)
+    if path not in _ensured_dirs:
+        path.mkdir(parents=True, exist_ok=True)
+        _ensured_dirs.add(path)
+    return path
+
+
+def mission_output_dir(mission_id: int) -> Path:
+    """Return missions/<mission_id>/, creating it on first use."""
+    return ensure_dir(MISSIONS_DIR / str(mission_id))
@@ -0,0 +1,44 @@
+"""
+Typed views of the mission spec produced by mission_planner.
+
+Only the fields the coverage math needs are declared; unknown fields
+(constraints, regulatory, notes, ...) are ignored when decoding.
+"""
+from typing import Any, Dict, Union
+
+import msgspec
+
+
+class Area(msgspec.Struct):
+    length_m: float = 0.0   # X direction
+    width_m: float = 0.0    # Y direction
+
+
+class Overlap(msgspec.Struct):
+    frontlap_percent: float = 75.0
+    sidelap_percent: float = 65.0
+
+
+class MissionSpec(msgspec.Struct):
+    area: Area = msgspec.field(default_factory=Area)
+    altitude_m: float = 50.0
+    camera_fov_deg: float = 78.0
+    overlap: Overlap = msgspec.field(default_factory=Overlap)
+
+
+DECODER = msgspec.json.Decoder(MissionSpec)
+
+
+def as_mission_spec(mission_spec: Union[MissionSpec, Dict[str, Any], str, bytes]) -> MissionSpec:
+    """
+    Coerce a mission spec into a MissionSpec.
+
+    JSON str/bytes are decoded straight into the struct; dicts (the form
+    most callers hold) are converted, accepting numeric strings like the
+    float() coercion this replaces.
+    """
+    if isinstance(mission_spec, MissionSpec):
+        return mission_spec
+    if isinstance(mission_spec, (str, bytes)):
+        return DECODER.decode(mission_spec)
+    return msgspec.convert(mission_spec, MissionSpec, strict=False)
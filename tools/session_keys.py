@@ -0,0 +1,7 @@
+"""
+Keys the pipeline tools use in ADK session state.
+
+Kept apart from tools/mission_state.py so readers such as chat.py can
+import them without loading the coverage math.
+"""
+MISSION_ID_KEY = "mission_id"
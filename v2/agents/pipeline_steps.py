@@ -18,7 +18,7 @@ if _project_root not in sys.path:
 from tools.coverage_calculator import compute_coverage
 from mission_db.mission_repo import init_db, create_mission_with_spec
 from agents.ros_config_agent import generate_ros_waypoints, generate_ros_config
-from agents.documentation_agent import create_mission_brief
+from agents.documentation_agent import write_mission_brief
 
 from v2.core.pipeline import PipelineStep, PipelineContext
 
@@ -100,9 +100,9 @@ class DocumentationStep(PipelineStep):
 
         coverage_summary = coverage_plan.get("coverage_summary", {})
 
-        brief = create_mission_brief(
-            mission_spec_json=json.dumps(mission_spec),
-            coverage_summary_json=json.dumps(coverage_summary),
+        brief = write_mission_brief(
+            mission_spec=mission_spec,
+            coverage_summary=coverage_summary,
             mission_id=mission_id,
         )
 